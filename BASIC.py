@@ -2,9 +2,12 @@
 import sys
 import os
 import pickle
+import queue
+import threading
 import pyodbc
 import sqlparse
 import traceback
+from contextlib import contextmanager
 
 from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtCore import (
@@ -48,6 +51,7 @@ class ODBCConnectDialog(QDialog):
         self.setWindowTitle("Connect to Teradata (ODBC)")
         self.resize(400, 230)
         self._conn = None
+        self._conn_str = None
         self._db_type = None
 
         layout = QVBoxLayout(self)
@@ -110,6 +114,7 @@ class ODBCConnectDialog(QDialog):
         try:
             cn = pyodbc.connect(conn_str, autocommit=True)
             self._conn = cn
+            self._conn_str = conn_str
             self._db_type = db_type
             self.accept()
         except Exception as e:
@@ -121,6 +126,127 @@ class ODBCConnectDialog(QDialog):
     def get_db_type(self):
         return self._db_type
 
+    def get_conn_str(self):
+        return self._conn_str
+
+###############################################################################
+# ConnectionPool - one pyodbc connection per background worker
+###############################################################################
+class ConnectionPool:
+    """
+    Small pool of pyodbc connections opened from one connection string.
+    pyodbc connections must not be used from several threads at once, so
+    background catalog workers check out their own connection here instead
+    of sharing the GUI's; with several checked out, DB expansions run in
+    parallel rather than queueing behind each other.
+    """
+
+    def __init__(self, conn_str, size=4):
+        self.conn_str = conn_str
+        self.size = size
+        self._idle = queue.Queue()
+        # One slot per connection that may exist; released on return *and*
+        # on discard, so a waiter always wakes once capacity frees up.
+        self._slots = threading.Semaphore(size)
+        self._closed = False
+
+    @contextmanager
+    def acquire(self):
+        """
+        Check out a live connection (blocking if all `size` are in use).
+        If the work fails with a connection-level error the connection is
+        closed rather than returned; ordinary SQL errors keep it.
+        """
+        self._slots.acquire()
+        try:
+            cn = self._checkout()
+            broken = False
+            try:
+                yield cn
+            except (pyodbc.OperationalError, pyodbc.InterfaceError):
+                broken = True
+                raise
+            finally:
+                if broken or self._closed:
+                    self._close(cn)
+                else:
+                    self._idle.put(cn)
+        finally:
+            self._slots.release()
+
+    def _checkout(self):
+        # Caller holds a slot, so opening a new connection never exceeds size.
+        while True:
+            try:
+                cn = self._idle.get_nowait()
+            except queue.Empty:
+                return pyodbc.connect(self.conn_str, autocommit=True)
+            if self._is_alive(cn):
+                return cn
+            self._close(cn)
+
+    @staticmethod
+    def _is_alive(cn):
+        try:
+            cn.getinfo(pyodbc.SQL_DBMS_NAME)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(cn):
+        try:
+            cn.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        """Close idle connections; ones still checked out close on return."""
+        self._closed = True
+        while True:
+            try:
+                cn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close(cn)
+
+@contextmanager
+def worker_connection(pool, fallback):
+    """Pooled connection when a pool is set up, else the shared one."""
+    if pool is None:
+        yield fallback
+    else:
+        with pool.acquire() as cn:
+            yield cn
+
+###############################################################################
+# DBC catalog queries
+###############################################################################
+# Names are bound as ? parameters, never formatted into the text: the SQL text
+# stays constant, so Teradata's request cache and pyodbc's prepared statement
+# (reused while the same text is executed again on a cursor) both get hits,
+# and quotes in object names can't break the query.
+TABLES_FOR_DB_SQL = """
+    SELECT TableName
+    FROM DBC.TablesV
+    WHERE DatabaseName=? AND TableKind='T'
+    ORDER BY TableName
+"""
+
+COLUMNS_FOR_TABLE_SQL = """
+    SELECT ColumnName
+    FROM DBC.ColumnsV
+    WHERE DatabaseName=? AND TableName=?
+    ORDER BY ColumnId
+"""
+
+COLUMNS_BY_TABLE_NAME_SQL = """
+    SELECT ColumnName
+    FROM DBC.ColumnsV
+    WHERE TableName=?
+    ORDER BY ColumnId
+"""
+
 ###############################################################################
 # LazySchemaLoaderWorker (For Teradata) - Loads Tables in background
 ###############################################################################
@@ -133,24 +259,20 @@ class LazySchemaLoaderWorker(QRunnable):
     Worker that loads table names for a specific Teradata database (schema) in a separate thread.
     """
 
-    def __init__(self, connection, database_name):
+    def __init__(self, connection, database_name, pool=None):
         super().__init__()
         self.connection = connection
         self.database_name = database_name
+        self.pool = pool
         self.signals = LazySchemaLoaderWorkerSignals()
 
     @QtCore.pyqtSlot()
     def run(self):
         try:
-            cursor = self.connection.cursor()
-            query = f"""
-                SELECT TableName 
-                FROM DBC.TablesV
-                WHERE DatabaseName='{self.database_name}' AND TableKind='T'
-                ORDER BY TableName
-            """
-            cursor.execute(query)
-            results = cursor.fetchall()
+            with worker_connection(self.pool, self.connection) as cn:
+                cursor = cn.cursor()
+                cursor.execute(TABLES_FOR_DB_SQL, (self.database_name,))
+                results = cursor.fetchall()
             tables = [row[0] for row in results]
             self.signals.finished.emit(tables)
         except Exception as e:
@@ -160,6 +282,60 @@ class LazySchemaLoaderWorker(QRunnable):
             )
             self.signals.error.emit(err)
 
+###############################################################################
+# CatalogPrefetchWorker - whole DBC table/column catalog in two queries
+###############################################################################
+# Set False to fall back to per-expansion DBC queries only (e.g. huge catalogs
+# where a full ColumnsV scan is not wanted on connect).
+PREFETCH_CATALOG = True
+
+class CatalogPrefetchWorkerSignals(QObject):
+    finished = pyqtSignal(object)  # Emitted with (tables_by_db, cols_by_table)
+    error = pyqtSignal(str)
+
+class CatalogPrefetchWorker(QRunnable):
+    """
+    Loads every table name and every column name in one DBC.TablesV and one
+    DBC.ColumnsV query, so later tree expansions read from memory instead of
+    paying a network round-trip each.
+    """
+
+    def __init__(self, connection, pool=None):
+        super().__init__()
+        self.connection = connection
+        self.pool = pool
+        self.signals = CatalogPrefetchWorkerSignals()
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        try:
+            with worker_connection(self.pool, self.connection) as cn:
+                cursor = cn.cursor()
+                cursor.arraysize = 10000
+
+                tables_by_db = {}
+                cursor.execute("""
+                    SELECT DatabaseName, TableName
+                    FROM DBC.TablesV
+                    WHERE TableKind='T'
+                    ORDER BY DatabaseName, TableName
+                """)
+                for db_name, table_name in cursor.fetchall():
+                    tables_by_db.setdefault(db_name, []).append(table_name)
+
+                cols_by_table = {}
+                cursor.execute("""
+                    SELECT DatabaseName, TableName, ColumnName
+                    FROM DBC.ColumnsV
+                    ORDER BY DatabaseName, TableName, ColumnId
+                """)
+                for db_name, table_name, col_name in cursor.fetchall():
+                    cols_by_table.setdefault((db_name, table_name), []).append(col_name)
+
+            self.signals.finished.emit((tables_by_db, cols_by_table))
+        except Exception as e:
+            self.signals.error.emit(f"Catalog prefetch failed: {e}")
+
 ###############################################################################
 # LazySchemaTreeWidget
 ###############################################################################
@@ -172,18 +348,26 @@ class LazySchemaTreeWidget(QTreeWidget):
       - Columns
     """
 
-    def __init__(self, connection, parent=None):
+    def __init__(self, connection, parent=None, pool=None):
         super().__init__(parent)
         self.connection = connection
+        self.pool = pool  # ConnectionPool for background workers; None => share self.connection
         self.setHeaderHidden(True)
         self.setDragEnabled(True)
         self.setSelectionMode(QAbstractItemView.SingleSelection)
         self.threadpool = QThreadPool.globalInstance()
+        # Filled by CatalogPrefetchWorker; None until (or unless) the prefetch lands
+        self._tables_by_db = None
+        self._cols_by_table = None
+        self._catalog_gen = 0
         self.itemExpanded.connect(self.on_item_expanded)
         self.populate_top_level()
 
     def populate_top_level(self):
         self.clear()
+        self._tables_by_db = None
+        self._cols_by_table = None
+        self._catalog_gen += 1
         conn_name = "Teradata"
         if self.connection:
             try:
@@ -227,6 +411,25 @@ class LazySchemaTreeWidget(QTreeWidget):
 
         self.expandItem(conn_item)
 
+        if PREFETCH_CATALOG:
+            self.prefetch_catalog()
+
+    def prefetch_catalog(self):
+        """
+        Start the two-query catalog load in the background. Expansions that
+        happen before it finishes still use the per-database/per-table queries.
+        """
+        gen = self._catalog_gen
+        worker = CatalogPrefetchWorker(self.connection, self.pool)
+        worker.signals.finished.connect(lambda res, g=gen: self.on_catalog_prefetched(g, res))
+        worker.signals.error.connect(lambda msg: print("[ERROR]", msg))
+        self.threadpool.start(worker)
+
+    def on_catalog_prefetched(self, gen, result):
+        if gen != self._catalog_gen:
+            return  # reconnected/refreshed since this prefetch started
+        self._tables_by_db, self._cols_by_table = result
+
     def on_item_expanded(self, item):
         data_type = item.data(0, Qt.UserRole)
         loaded_flag = item.data(0, Qt.UserRole + 1)
@@ -235,7 +438,10 @@ class LazySchemaTreeWidget(QTreeWidget):
             # load tables
             item.takeChildren()
             db_name = item.text(0)
-            worker = LazySchemaLoaderWorker(self.connection, db_name)
+            if self._tables_by_db is not None:
+                self.populate_database_node(item, self._tables_by_db.get(db_name, []))
+                return
+            worker = LazySchemaLoaderWorker(self.connection, db_name, self.pool)
             worker.signals.finished.connect(lambda tbls, it=item: self.populate_database_node(it, tbls))
             worker.signals.error.connect(self.handle_error)
             self.threadpool.start(worker)
@@ -277,15 +483,13 @@ class LazySchemaTreeWidget(QTreeWidget):
         columns = []
         if not self.connection:
             return columns
+        if self._cols_by_table is not None:
+            cached = self._cols_by_table.get((db_name, table_name))
+            if cached is not None:
+                return cached
         try:
             cursor = self.connection.cursor()
-            query = f"""
-                SELECT ColumnName
-                FROM DBC.ColumnsV
-                WHERE DatabaseName='{db_name}' AND TableName='{table_name}'
-                ORDER BY ColumnId
-            """
-            cursor.execute(query)
+            cursor.execute(COLUMNS_FOR_TABLE_SQL, (db_name, table_name))
             results = cursor.fetchall()
             columns = [row[0] for row in results]
         except Exception as e:
@@ -1580,6 +1784,7 @@ class VisualQueryBuilderTab(QWidget):
 
         QApplication.setStyle("Windows")
         self.threadpool = QThreadPool.globalInstance()
+        QApplication.instance().aboutToQuit.connect(self.close_connections)
 
         self.initUI()
 
@@ -1748,7 +1953,8 @@ class VisualQueryBuilderTab(QWidget):
             db_type = dlg.get_db_type()
             if conn and db_type and db_type.upper() == "TERADATA":
                 alias = f"{db_type}_{len(self.connections) + 1}"
-                conn_info = {"type": db_type, "connection": conn}
+                conn_info = {"type": db_type, "connection": conn,
+                             "pool": ConnectionPool(dlg.get_conn_str())}
                 self.connections[alias] = conn_info
                 self.schema_cache_files[alias] = f"schema_cache_{alias}.pkl"
                 self.update_connection_status(True, f"{db_type} ({alias})")
@@ -1757,11 +1963,24 @@ class VisualQueryBuilderTab(QWidget):
             else:
                 QMessageBox.warning(self, "Only Teradata Allowed", "Restricted to Teradata DSNs only.")
 
+    def close_connections(self):
+        """Close every alias's worker pool and GUI connection on teardown."""
+        for info in self.connections.values():
+            pool = info.get('pool')
+            if pool is not None:
+                pool.close_all()
+            try:
+                info['connection'].close()
+            except Exception:
+                pass
+        self.connections.clear()
+
     def load_schema(self, alias):
         if alias not in self.connections:
             return
         conn = self.connections[alias]['connection']
         self.schema_tree.connection = conn
+        self.schema_tree.pool = self.connections[alias].get('pool')
         self.schema_tree.populate_top_level()
         self.status_bar.showMessage("Schema loaded.", 3000)
 
@@ -1875,13 +2094,7 @@ class VisualQueryBuilderTab(QWidget):
             cur = conn.cursor()
             # Basic approach: search DBC.ColumnsV or fallback
             # (You may adapt for your environment.)
-            query = f"""
-                SELECT ColumnName
-                FROM DBC.ColumnsV
-                WHERE TableName='{table_name}'
-                ORDER BY ColumnId
-            """
-            cur.execute(query)
+            cur.execute(COLUMNS_BY_TABLE_NAME_SQL, (table_name,))
             rows = cur.fetchall()
             return [r[0] for r in rows]
         except: